@@ -1,11 +1,15 @@
-from agents import Agent,Runner, ModelSettings, function_tool
+from agents import Agent,Runner, ModelSettings, function_tool, handoff
 from dotenv import load_dotenv
 import asyncio
 import os
+import re
 from typing import List, Optional
 from agents import set_default_openai_key
+from openai.types.responses import ResponseTextDeltaEvent
 
-load_dotenv()
+# Load environment variables (skipped when the key is already set, e.g. by an earlier import)
+if "OPENAI_API_KEY" not in os.environ:
+    load_dotenv()
 
 api_key = os.environ.get("OPENAI_API_KEY")
 set_default_openai_key(api_key)
@@ -85,48 +89,61 @@ triage_agent = Agent(
     For general travel questions, answer directly without handing off.
     Be friendly and helpful in all interactions.
     """,
-    handoffs=[booking_agent, refund_agent]
+    # Wrapped once here; bare agents would be re-wrapped into handoffs on every run
+    handoffs=[handoff(booking_agent), handoff(refund_agent)]
 )
 
+# Unambiguous requests in interactive mode go straight to the specialist,
+# skipping the triage model call; everything else is triaged as usual
+_FAST_ROUTE = re.compile(
+    # Only explicit requests ("I need a refund", "want to book a flight") count; a passing
+    # mention of a refund must still reach triage, since the specialists cannot hand back
+    r"(?<!n't )(?<!not )\b(?:want|need|request|like|get)\s+"
+    r"(?:(?P<refund>(?:a\s+|my\s+)?refund)|(?P<booking>to\s+book\s+a\s+flight))\b",
+    re.IGNORECASE,
+)
+_FAST_ROUTE_AGENTS = {"refund": refund_agent, "booking": booking_agent}
+
+def fast_route(user_input: str) -> Agent:
+    """Pick the agent that should answer first: a specialist on a clear keyword hit, otherwise triage"""
+    match = _FAST_ROUTE.search(user_input)
+    return _FAST_ROUTE_AGENTS[match.lastgroup] if match else triage_agent
+
 async def main():
     # Example conversations
-    booking_query = "I need to book a flight from New York to Los Angeles next week"
-    refund_query = "I need to cancel my flight and get a refund. My booking reference is ABC123"
-    general_query = "What's the weather like in Paris this time of year?"
+    examples = [
+        ("Booking", "I need to book a flight from New York to Los Angeles next week"),
+        ("Refund", "I need to cancel my flight and get a refund. My booking reference is ABC123"),
+        ("General", "What's the weather like in Paris this time of year?"),
+    ]
     
     # Create a runner - fix: don't pass agent to Runner constructor
     runner = Runner()
     
-    # Simulate conversations with different queries
-    print("\n--- Booking Query Example ---")
-    response = await runner.run(triage_agent, booking_query)
-    print(f"Initial Query: {booking_query}")
-    print(f"Response: {response.final_output}")
-    print(f"Handled by: {response.agent_name if hasattr(response, 'agent_name') else triage_agent.name}")
-    
-    print("\n--- Refund Query Example ---")
-    response = await runner.run(triage_agent, refund_query)
-    print(f"Initial Query: {refund_query}")
-    print(f"Response: {response.final_output}")
-    print(f"Handled by: {response.agent_name if hasattr(response, 'agent_name') else triage_agent.name}")
-    
-    print("\n--- General Query Example ---")
-    response = await runner.run(triage_agent, general_query)
-    print(f"Initial Query: {general_query}")
-    print(f"Response: {response.final_output}")
-    print(f"Handled by: {response.agent_name if hasattr(response, 'agent_name') else triage_agent.name}")
+    # Simulate conversations with different queries; they are independent, so run them concurrently
+    responses = await asyncio.gather(*(runner.run(triage_agent, query) for _, query in examples))
+    for (label, query), response in zip(examples, responses):
+        print(f"\n--- {label} Query Example ---")
+        print(f"Initial Query: {query}")
+        print(f"Response: {response.final_output}")
+        print(f"Handled by: {response.agent_name if hasattr(response, 'agent_name') else triage_agent.name}")
     
     # Optional: Interactive mode
     print("\n--- Interactive Mode ---")
     print("Type 'exit' to quit")
     while True:
-        user_input = input("\nYou: ")
+        # Read stdin on a worker thread so the event loop stays free while the user types
+        user_input = await asyncio.to_thread(input, "\nYou: ")
         if user_input.lower() == 'exit':
             break
         
-        response = await runner.run(triage_agent, user_input)
-        agent_name = response.agent_name if hasattr(response, 'agent_name') else triage_agent.name
-        print(f"\nAgent ({agent_name}): {response.final_output}")
+        # Stream the answer so it shows up as it is generated
+        result = runner.run_streamed(fast_route(user_input), user_input)
+        print("\nAgent: ", end="", flush=True)
+        async for event in result.stream_events():
+            if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                print(event.data.delta, end="", flush=True)
+        print(f"\n(handled by {result.last_agent.name})")
 
 if __name__ == "__main__":
     asyncio.run(main()) 
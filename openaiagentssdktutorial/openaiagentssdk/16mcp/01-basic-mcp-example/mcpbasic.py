@@ -11,11 +11,11 @@ openai_api_key = os.environ.get("OPENAI_API_KEY")
 openai_model = os.environ.get("OPENAI_MODEL")
 set_default_openai_key(openai_api_key)
 
+# Path to the directory with sample files for the MCP filesystem
+current_dir = os.path.dirname(os.path.abspath(__file__))
+samples_dir = os.path.join(current_dir, "sample_files")
+
 async def main():
-    # Path to the directory with sample files for the MCP filesystem
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    samples_dir = os.path.join(current_dir, "sample_files")
-    
     # Start the MCP server as subprocess (using npx)
     async with MCPServerStdio(
         params={
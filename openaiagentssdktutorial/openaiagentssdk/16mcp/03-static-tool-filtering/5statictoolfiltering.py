@@ -5,8 +5,9 @@ from dotenv import load_dotenv
 from agents import Agent, Runner, set_default_openai_key
 from agents.mcp import MCPServerStdio
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (skipped when they are already set, e.g. by an earlier import)
+if "OPENAI_API_KEY" not in os.environ or "OPENAI_MODEL" not in os.environ:
+    load_dotenv()
 openai_api_key = os.environ.get("OPENAI_API_KEY")
 openai_model = os.environ.get("OPENAI_MODEL")
 set_default_openai_key(openai_api_key)
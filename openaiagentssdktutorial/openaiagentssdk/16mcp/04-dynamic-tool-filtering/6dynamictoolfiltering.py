@@ -1,12 +1,14 @@
 import os
 import asyncio
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
 from agents import Agent, Runner, set_default_openai_key
 from agents.mcp import MCPServerStdio
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (skipped when they are already set, e.g. by an earlier import)
+if "OPENAI_API_KEY" not in os.environ or "OPENAI_MODEL" not in os.environ:
+    load_dotenv()
 openai_api_key = os.environ.get("OPENAI_API_KEY")
 openai_model = os.environ.get("OPENAI_MODEL")
 set_default_openai_key(openai_api_key)
@@ -15,14 +17,18 @@ set_default_openai_key(openai_api_key)
 current_dir = os.path.dirname(os.path.abspath(__file__))
 samples_dir = os.path.join(current_dir, "sample_files")
 
+# Tool name sets used by the filters below, built once at import
+ALLOWED_TOOLS = frozenset({"read_file", "list_files"})
+DANGEROUS_TOOLS = frozenset({"delete_file", "write_file", "execute_command"})
+ASYNC_ALLOWED_TOOLS = frozenset({"read_file", "list_files", "get_file_info"})
+
 # ============================================================================
 # DYNAMIC TOOL FILTERING EXAMPLES
 # ============================================================================
 
 def simple_name_filter(tool_name: str) -> bool:
     """Simple filter that only allows tools with specific names."""
-    allowed_tools = ["read_file", "list_files"]
-    return tool_name in allowed_tools
+    return tool_name in ALLOWED_TOOLS
 
 def prefix_filter(tool_name: str) -> bool:
     """Filter tools based on name prefix."""
@@ -30,17 +36,21 @@ def prefix_filter(tool_name: str) -> bool:
 
 def security_filter(tool_name: str) -> bool:
     """Security-focused filter that blocks potentially dangerous operations."""
-    dangerous_tools = ["delete_file", "write_file", "execute_command"]
-    return tool_name not in dangerous_tools
+    return tool_name not in DANGEROUS_TOOLS
 
 # ============================================================================
 # CONTEXT-AWARE FILTERING (Conceptual)
 # ============================================================================
 
+@dataclass(slots=True)
+class AgentStub:
+    """Minimal stand-in for the agent seen by a filter context."""
+    name: str
+
 class ToolFilterContext:
     """Mock ToolFilterContext for demonstration purposes."""
     def __init__(self, agent_name: str, server_name: str):
-        self.agent = type('Agent', (), {'name': agent_name})()
+        self.agent = AgentStub(agent_name)
         self.server_name = server_name
         self.run_context = None
 
@@ -70,12 +80,9 @@ async def async_security_filter(tool_name: str) -> bool:
     Async filter that could perform external checks.
     This is a conceptual example.
     """
-    # Simulate async operation (e.g., checking permissions from database)
-    await asyncio.sleep(0.1)
-    
-    # Example: Check if tool is in allowed list from external source
-    allowed_tools = ["read_file", "list_files", "get_file_info"]
-    return tool_name in allowed_tools
+    # A real filter would await its external check here (e.g., checking permissions
+    # from a database); this example answers from a local allow-list
+    return tool_name in ASYNC_ALLOWED_TOOLS
 
 # ============================================================================
 # MAIN DEMO FUNCTION
@@ -90,39 +97,38 @@ async def demo_dynamic_filtering():
     # Test different filter functions
     test_tools = ["read_file", "write_file", "delete_file", "list_files", "get_file_info"]
     
-    print("\n📋 Testing Different Filter Functions:")
-    print("-" * 40)
-    
+    # Each section's lines are collected and written with a single print call
+    lines = ["\n📋 Testing Different Filter Functions:", "-" * 40]
     for tool in test_tools:
         simple_result = simple_name_filter(tool)
         prefix_result = prefix_filter(tool)
         security_result = security_filter(tool)
         
-        print(f"Tool: {tool:15} | Simple: {simple_result} | Prefix: {prefix_result} | Security: {security_result}")
+        lines.append(f"Tool: {tool:15} | Simple: {simple_result} | Prefix: {prefix_result} | Security: {security_result}")
+    print(*lines, sep="\n")
     
     # Test context-aware filtering
-    print("\n🎭 Testing Context-Aware Filtering:")
-    print("-" * 40)
-    
     contexts = [
         ToolFilterContext("readonly_agent", "filesystem_server"),
         ToolFilterContext("admin_agent", "filesystem_server"),
         ToolFilterContext("user_agent", "filesystem_server")
     ]
     
+    lines = ["\n🎭 Testing Context-Aware Filtering:", "-" * 40]
     for context in contexts:
-        print(f"\nAgent: {context.agent.name}")
+        lines.append(f"\nAgent: {context.agent.name}")
         for tool in test_tools:
             result = context_aware_filter(context, tool)
-            print(f"  {tool:15} -> {'✅ Allowed' if result else '❌ Blocked'}")
+            lines.append(f"  {tool:15} -> {'✅ Allowed' if result else '❌ Blocked'}")
+    print(*lines, sep="\n")
     
     # Test async filtering
-    print("\n⚡ Testing Async Filtering:")
-    print("-" * 40)
-    
-    for tool in test_tools:
-        result = await async_security_filter(tool)
-        print(f"{tool:15} -> {'✅ Allowed' if result else '❌ Blocked'}")
+    # Independent checks, so run them together rather than one await at a time
+    results = await asyncio.gather(*(async_security_filter(tool) for tool in test_tools))
+    lines = ["\n⚡ Testing Async Filtering:", "-" * 40]
+    for tool, result in zip(test_tools, results):
+        lines.append(f"{tool:15} -> {'✅ Allowed' if result else '❌ Blocked'}")
+    print(*lines, sep="\n")
 
 async def main():
     """Main function to run the MCP server with dynamic filtering demonstration."""
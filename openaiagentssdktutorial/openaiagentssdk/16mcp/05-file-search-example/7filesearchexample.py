@@ -6,12 +6,17 @@ from dotenv import load_dotenv
 from agents import Agent, Runner, set_default_openai_key
 from agents.mcp import MCPServerStdio
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (skipped when they are already set, e.g. by an earlier import)
+if "OPENAI_API_KEY" not in os.environ or "OPENAI_MODEL" not in os.environ:
+    load_dotenv()
 openai_api_key = os.environ.get("OPENAI_API_KEY")
 openai_model = os.environ.get("OPENAI_MODEL")
 set_default_openai_key(openai_api_key)
 
+# Directory containing sample files
+current_dir = os.path.dirname(os.path.abspath(__file__))
+samples_dir = os.path.join(current_dir, "sample_files")
+
 async def run(mcp_server):
     """Run the file search example with the MCP server."""
     
@@ -70,9 +75,6 @@ async def main():
     if not shutil.which("npx"):
         raise RuntimeError("npx is not installed. Please install it with `npm install -g npx`.")
 
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    samples_dir = os.path.join(current_dir, "sample_files")
-
     print("🚀 MCP File Search Example")
     print("=" * 60)
     print(f"📁 Sample files directory: {samples_dir}")
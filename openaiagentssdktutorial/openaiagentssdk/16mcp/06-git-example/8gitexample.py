@@ -1,6 +1,8 @@
 import asyncio
+import functools
 import shutil
 import os
+import stat
 from dotenv import load_dotenv
 
 from agents import Agent, Runner, set_default_openai_key
@@ -12,17 +14,48 @@ openai_api_key = os.environ.get("OPENAI_API_KEY")
 openai_model = os.environ.get("OPENAI_MODEL")
 set_default_openai_key(openai_api_key)
 
-async def run(mcp_server, directory_path: str):
-    """Run the Git analysis example with the MCP server."""
+# Static instructions: keeping them free of per-run values lets the provider reuse the cached prompt prefix
+GIT_SYSTEM = (
+    "Answer questions about the git repository whose path is given at the start of the user's message. "
+    "Use the git tools to analyze the repository and provide detailed insights. "
+    "When you analyze the repository, remember the information to answer follow-up questions."
+)
+
+@functools.lru_cache(maxsize=1)
+def _find_uvx():
+    """Locate uvx on PATH once per process."""
+    return shutil.which("uvx")
+
+def _check_git_repository(directory_path: str):
+    """Return an error message if directory_path is not a git repository, else None.
+
+    The common case costs a single stat of the .git entry; the directory
+    itself is only inspected when that fails, to pick the right message.
+    """
+    # An empty path would otherwise resolve to ".git" in the current directory
+    if not directory_path.strip():
+        return f"Directory '{directory_path}' does not exist."
+
+    try:
+        os.stat(os.path.join(directory_path, ".git"))
+        return None
+    except OSError:
+        pass
+
+    try:
+        st = os.stat(directory_path)
+    except OSError:
+        return f"Directory '{directory_path}' does not exist."
+    if not stat.S_ISDIR(st.st_mode):
+        return f"'{directory_path}' is not a directory."
+    return f"'{directory_path}' is not a git repository (no .git directory found)."
+
+async def run(agent: Agent, directory_path: str):
+    """Run the Git analysis demos against the repository at directory_path."""
     
-    agent = Agent(
-        name="Git Repository Assistant",
-        model=openai_model,
-        instructions=f"Answer questions about the git repository at {directory_path}. "
-                    "Use the git tools to analyze the repository and provide detailed insights. "
-                    "When you analyze the repository, remember the information to answer follow-up questions.",
-        mcp_servers=[mcp_server],
-    )
+    def with_repository(message: str) -> str:
+        # The path travels in the user message so the instructions stay identical across repositories
+        return f"[Repository path: {directory_path}]\n{message}"
 
     # Demo 1: Find most frequent contributor
     print("=" * 60)
@@ -30,7 +63,7 @@ async def run(mcp_server, directory_path: str):
     print("=" * 60)
     message = "Who's the most frequent contributor?"
     print(f"Running: {message}")
-    result = await Runner.run(starting_agent=agent, input=message)
+    result = await Runner.run(starting_agent=agent, input=with_repository(message))
     print("🧠 Response:")
     print(result.final_output)
 
@@ -40,7 +73,7 @@ async def run(mcp_server, directory_path: str):
     print("=" * 60)
     message = "Summarize the last change in the repository."
     print(f"Running: {message}")
-    result = await Runner.run(starting_agent=agent, input=message)
+    result = await Runner.run(starting_agent=agent, input=with_repository(message))
     print("🧠 Response:")
     print(result.final_output)
 
@@ -50,7 +83,7 @@ async def run(mcp_server, directory_path: str):
     print("=" * 60)
     message = "Provide an overview of the repository including recent commits, contributors, and project structure."
     print(f"Running: {message}")
-    result = await Runner.run(starting_agent=agent, input=message)
+    result = await Runner.run(starting_agent=agent, input=with_repository(message))
     print("🧠 Response:")
     print(result.final_output)
 
@@ -60,7 +93,7 @@ async def run(mcp_server, directory_path: str):
     print("=" * 60)
     message = "List all branches and show the latest commit on each branch."
     print(f"Running: {message}")
-    result = await Runner.run(starting_agent=agent, input=message)
+    result = await Runner.run(starting_agent=agent, input=with_repository(message))
     print("🧠 Response:")
     print(result.final_output)
 
@@ -68,7 +101,7 @@ async def main():
     """Main function to run the Git analysis example."""
     
     # Check if uvx is available
-    if not shutil.which("uvx"):
+    if not _find_uvx():
         print("⚠️  uvx is not installed. Installing mcp-server-git via npx instead...")
         use_npx = True
     else:
@@ -80,51 +113,43 @@ async def main():
     # Ask the user for the directory path
     directory_path = input("Please enter the path to the git repository: ").strip()
     
-    # Validate the directory path
-    if not os.path.exists(directory_path):
-        print(f"❌ Error: Directory '{directory_path}' does not exist.")
-        return
-    
-    if not os.path.isdir(directory_path):
-        print(f"❌ Error: '{directory_path}' is not a directory.")
-        return
-    
-    # Check if it's a git repository
-    git_dir = os.path.join(directory_path, ".git")
-    if not os.path.exists(git_dir):
-        print(f"❌ Error: '{directory_path}' is not a git repository (no .git directory found).")
+    # Validate that the path is a git repository
+    error = _check_git_repository(directory_path)
+    if error:
+        print(f"❌ Error: {error}")
         return
     
     print(f"✅ Git repository found at: {directory_path}")
     print("=" * 60)
 
+    if use_npx:
+        # Use npx as fallback
+        launcher = "npx"
+        params = {
+            "command": "npx",
+            "args": ["-y", "@modelcontextprotocol/server-git", directory_path],
+        }
+    else:
+        # Use uvx as intended
+        launcher = "uvx"
+        params = {
+            "command": "uvx", 
+            "args": ["mcp-server-git", directory_path]
+        }
+
     try:
-        if use_npx:
-            # Use npx as fallback
-            async with MCPServerStdio(
-                params={
-                    "command": "npx",
-                    "args": ["-y", "@modelcontextprotocol/server-git", directory_path],
-                }
-            ) as server:
-                print("✅ MCP Git Server started successfully via npx!")
-                print("🔍 Server is ready to analyze git repository")
-                print()
-                
-                await run(server, directory_path)
-        else:
-            # Use uvx as intended
-            async with MCPServerStdio(
-                params={
-                    "command": "uvx", 
-                    "args": ["mcp-server-git", directory_path]
-                }
-            ) as server:
-                print("✅ MCP Git Server started successfully via uvx!")
-                print("🔍 Server is ready to analyze git repository")
-                print()
-                
-                await run(server, directory_path)
+        async with MCPServerStdio(params=params) as server:
+            print(f"✅ MCP Git Server started successfully via {launcher}!")
+            print("🔍 Server is ready to analyze git repository")
+            print()
+            
+            agent = Agent(
+                name="Git Repository Assistant",
+                model=openai_model,
+                instructions=GIT_SYSTEM,
+                mcp_servers=[server],
+            )
+            await run(agent, directory_path)
 
     except Exception as e:
         print(f"\n❌ Error starting MCP Git server: {e}")
@@ -1,12 +1,18 @@
 import os
 import asyncio
+import string
+from collections import ChainMap
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 from agents import Agent, Runner, set_default_openai_key
 from agents.mcp import MCPServerStdio
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (skipped when they are already set, e.g. by an earlier import)
+if "OPENAI_API_KEY" not in os.environ or "OPENAI_MODEL" not in os.environ:
+    load_dotenv()
 openai_api_key = os.environ.get("OPENAI_API_KEY")
 openai_model = os.environ.get("OPENAI_MODEL")
 set_default_openai_key(openai_api_key)
@@ -15,25 +21,52 @@ set_default_openai_key(openai_api_key)
 current_dir = os.path.dirname(os.path.abspath(__file__))
 samples_dir = os.path.join(current_dir, "sample_files")
 
+# Section separators used by the demo output
+_SEP40 = "-" * 40
+_SEP50 = "=" * 50
+_SEP60 = "=" * 60
+_NL_SEP60 = "\n" + _SEP60
+
 # ============================================================================
 # MOCK MCP PROMPTS SYSTEM (for demonstration)
 # ============================================================================
 
+@dataclass(slots=True, frozen=True)
 class MockPrompt:
     """Mock prompt class for demonstration."""
-    def __init__(self, name: str, description: str, template: str):
-        self.name = name
-        self.description = description
-        self.template = template
+    name: str
+    description: str
+    template: str
+    fields: frozenset[str] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Placeholder names, parsed once instead of on every render
+        object.__setattr__(self, "fields", frozenset(
+            placeholder for _, placeholder, _, _ in string.Formatter().parse(self.template) if placeholder
+        ))
+
+    def render(self, values) -> str:
+        """Render the template, looking placeholder names up in ``values``."""
+        return self.template.format_map(values)
+
+@dataclass(slots=True)
+class MockContent:
+    """Mock message content for demonstration."""
+    text: str
+
+@dataclass(slots=True)
+class MockMessage:
+    """Mock prompt message for demonstration."""
+    content: MockContent
 
 class MockPromptResult:
     """Mock prompt result class for demonstration."""
     def __init__(self, content: str):
-        self.messages = [type('Message', (), {'content': type('Content', (), {'text': content})()})()]
+        self.messages = [MockMessage(MockContent(content))]
 
 class MockPromptsResult:
     """Mock prompts list result for demonstration."""
-    def __init__(self, prompts: list):
+    def __init__(self, prompts: tuple):
         self.prompts = prompts
 
 # ============================================================================
@@ -90,6 +123,39 @@ Please analyze the data and provide insights with appropriate visualizations if
     )
 }
 
+# Default values for template placeholders the caller did not provide
+_DEFAULTS = MappingProxyType({
+    "focus_areas": "general analysis",
+    "depth": "standard",
+    "format": "detailed report",
+    "language": "general",
+    "focus": "code quality",
+    "standards": "industry best practices",
+    "security_level": "standard",
+    "length": "medium",
+    "key_points": "main topics",
+    "audience": "general",
+    "data_type": "text",
+    "analysis_type": "descriptive",
+    "visualization": "none"
+})
+
+def _render_uncached(name: str, arguments: dict) -> str:
+    """Render a prompt, filling missing placeholders from the defaults."""
+    prompt = SAMPLE_PROMPTS[name]
+    # Only layer the defaults underneath when a placeholder is actually missing
+    if prompt.fields - arguments.keys():
+        return prompt.render(ChainMap(arguments, _DEFAULTS))
+    return prompt.render(arguments)
+
+@lru_cache(maxsize=256)
+def _render(name: str, args_key: tuple[tuple[str, str], ...]) -> str:
+    """Render a prompt once per distinct set of arguments."""
+    return _render_uncached(name, dict(args_key))
+
+# The prompt list never changes, so it is built once
+_ALL_PROMPTS = MockPromptsResult(tuple(SAMPLE_PROMPTS.values()))
+
 # ============================================================================
 # MOCK MCP SERVER WITH PROMPTS SUPPORT
 # ============================================================================
@@ -97,41 +163,25 @@ Please analyze the data and provide insights with appropriate visualizations if
 class MockMCPServerWithPrompts:
     """Mock MCP server that supports prompts for demonstration."""
     
-    async def list_prompts(self):
+    def list_prompts(self):
         """List all available prompts."""
-        return MockPromptsResult(list(SAMPLE_PROMPTS.values()))
+        return _ALL_PROMPTS
     
-    async def get_prompt(self, name: str, arguments: dict = None):
+    def get_prompt(self, name: str, arguments: dict = None):
         """Get a specific prompt with optional parameters."""
         if name not in SAMPLE_PROMPTS:
             raise ValueError(f"Prompt '{name}' not found")
         
-        prompt = SAMPLE_PROMPTS[name]
+        # Repeated calls with the same arguments are served from the render cache
         arguments = arguments or {}
-        
-        # Format the template with provided arguments
+        key = tuple(sorted(arguments.items()))
         try:
-            content = prompt.template.format(**arguments)
-        except KeyError as e:
-            # Provide default values for missing arguments
-            defaults = {
-                "focus_areas": "general analysis",
-                "depth": "standard",
-                "format": "detailed report",
-                "language": "general",
-                "focus": "code quality",
-                "standards": "industry best practices",
-                "security_level": "standard",
-                "length": "medium",
-                "key_points": "main topics",
-                "audience": "general",
-                "data_type": "text",
-                "analysis_type": "descriptive",
-                "visualization": "none"
-            }
-            # Merge provided arguments with defaults
-            merged_args = {**defaults, **arguments}
-            content = prompt.template.format(**merged_args)
+            hash(key)
+        except TypeError:
+            # Unhashable argument values (e.g. lists) cannot be cached; render directly
+            content = _render_uncached(name, arguments)
+        else:
+            content = _render(name, key)
         
         return MockPromptResult(content)
 
@@ -139,79 +189,74 @@ class MockMCPServerWithPrompts:
 # PROMPTS DEMONSTRATION FUNCTIONS
 # ============================================================================
 
+# Prompt retrieval test cases: (prompt name, argument items)
+_TEST_CASES: tuple[tuple[str, tuple[tuple[str, str], ...]], ...] = (
+    ("file_analyzer", (
+        ("focus_areas", "security, performance, readability"),
+        ("depth", "comprehensive"),
+        ("format", "structured report"),
+    )),
+    ("code_reviewer", (
+        ("language", "Python"),
+        ("focus", "security vulnerabilities"),
+        ("standards", "PEP 8"),
+        ("security_level", "high"),
+    )),
+    ("document_summarizer", (
+        ("length", "concise"),
+        ("key_points", "technical details, conclusions"),
+        ("audience", "developers"),
+    )),
+)
+
 async def demonstrate_prompts_listing():
     """Demonstrate listing available prompts."""
-    print("📋 Listing Available Prompts")
-    print("=" * 50)
+    lines = ["📋 Listing Available Prompts", _SEP50]
     
     mock_server = MockMCPServerWithPrompts()
     
     try:
-        prompts_result = await mock_server.list_prompts()
+        prompts_result = mock_server.list_prompts()
         
-        print("Available prompts:")
-        for prompt in prompts_result.prompts:
-            print(f"  • {prompt.name}: {prompt.description}")
+        lines.append("Available prompts:")
+        lines.extend(f"  • {prompt.name}: {prompt.description}" for prompt in prompts_result.prompts)
         
         return True
     except Exception as e:
-        print(f"Error listing prompts: {e}")
+        lines.append(f"Error listing prompts: {e}")
         return False
+    finally:
+        print(*lines, sep="\n")
 
 async def demonstrate_prompt_retrieval():
     """Demonstrate retrieving specific prompts with parameters."""
-    print("\n🎯 Retrieving Specific Prompts")
-    print("=" * 50)
+    lines = ["\n🎯 Retrieving Specific Prompts", _SEP50]
     
     mock_server = MockMCPServerWithPrompts()
     
-    # Test different prompt types with various parameters
-    test_cases = [
-        {
-            "name": "file_analyzer",
-            "arguments": {
-                "focus_areas": "security, performance, readability",
-                "depth": "comprehensive",
-                "format": "structured report"
-            }
-        },
-        {
-            "name": "code_reviewer",
-            "arguments": {
-                "language": "Python",
-                "focus": "security vulnerabilities",
-                "standards": "PEP 8",
-                "security_level": "high"
-            }
-        },
-        {
-            "name": "document_summarizer",
-            "arguments": {
-                "length": "concise",
-                "key_points": "technical details, conclusions",
-                "audience": "developers"
-            }
-        }
-    ]
-    
-    for case in test_cases:
+    for name, args_items in _TEST_CASES:
+        arguments = dict(args_items)
         try:
-            prompt_result = await mock_server.get_prompt(case["name"], case["arguments"])
+            prompt_result = mock_server.get_prompt(name, arguments)
             instructions = prompt_result.messages[0].content.text
             
-            print(f"\n📝 Prompt: {case['name']}")
-            print(f"Arguments: {case['arguments']}")
-            print(f"Generated Instructions:")
-            print("-" * 40)
-            print(instructions[:200] + "..." if len(instructions) > 200 else instructions)
+            lines += (
+                f"\n📝 Prompt: {name}",
+                f"Arguments: {arguments}",
+                "Generated Instructions:",
+                _SEP40,
+                instructions[:200] + "..." if len(instructions) > 200 else instructions,
+            )
             
         except Exception as e:
-            print(f"Error retrieving prompt {case['name']}: {e}")
+            lines.append(f"Error retrieving prompt {name}: {e}")
+    
+    print(*lines, sep="\n")
 
 async def demonstrate_agent_with_prompts():
     """Demonstrate using prompts with an actual agent."""
     print("\n🤖 Using Prompts with MCP Agent")
-    print("=" * 50)
+    print(_SEP50)
     
     try:
         # Use the real MCP server for file access
@@ -224,7 +269,7 @@ async def demonstrate_agent_with_prompts():
 
             # Get a prompt for file analysis
             mock_server = MockMCPServerWithPrompts()
-            prompt_result = await mock_server.get_prompt(
+            prompt_result = mock_server.get_prompt(
                 "file_analyzer",
                 {
                     "focus_areas": "content analysis, structure, key themes",
@@ -266,24 +311,25 @@ async def demonstrate_agent_with_prompts():
 async def main():
     """Main function to demonstrate MCP prompts functionality."""
     
-    print("🚀 MCP Prompts Demo")
-    print("=" * 60)
+    print("🚀 MCP Prompts Demo", _SEP60, sep="\n")
     
     # Demonstrate different aspects of prompts
     await demonstrate_prompts_listing()
     await demonstrate_prompt_retrieval()
     await demonstrate_agent_with_prompts()
     
-    print("\n" + "=" * 60)
-    print("✅ MCP Prompts Demo Complete!")
-    print("=" * 60)
-    
-    print("\n📚 Key Concepts Demonstrated:")
-    print("  • Listing available prompts from MCP servers")
-    print("  • Retrieving specific prompts with parameters")
-    print("  • Using prompt-generated instructions with agents")
-    print("  • Dynamic instruction customization")
-    print("  • Reusable prompt templates")
+    print(
+        _NL_SEP60,
+        "✅ MCP Prompts Demo Complete!",
+        _SEP60,
+        "\n📚 Key Concepts Demonstrated:",
+        "  • Listing available prompts from MCP servers",
+        "  • Retrieving specific prompts with parameters",
+        "  • Using prompt-generated instructions with agents",
+        "  • Dynamic instruction customization",
+        "  • Reusable prompt templates",
+        sep="\n",
+    )
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
@@ -3,7 +3,9 @@ import os
 import shutil
 import subprocess
 import time
-from typing import Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable
 from dotenv import load_dotenv
 
 from agents import Agent, Runner, set_default_openai_key
@@ -15,10 +17,21 @@ openai_api_key = os.environ.get("OPENAI_API_KEY")
 openai_model = os.environ.get("OPENAI_MODEL")
 set_default_openai_key(openai_api_key)
 
+# Section separators used by the demo output
+_SEP60 = "=" * 60
+_NL_SEP60 = "\n" + _SEP60
+
 # ============================================================================
 # MOCK PROMPT SYSTEM (for demonstration since HTTP server might not work)
 # ============================================================================
 
+# Available prompts and their descriptions (read-only, shared by every call)
+PROMPT_DESCRIPTIONS = MappingProxyType({
+    "generate_code_review_instructions": "Generate agent instructions for code review tasks",
+    "generate_documentation_instructions": "Generate agent instructions for documentation tasks",
+    "generate_security_analysis_instructions": "Generate agent instructions for security analysis tasks"
+})
+
 class MockPromptServer:
     """Mock prompt server for demonstration purposes."""
     
@@ -28,6 +41,8 @@ class MockPromptServer:
             "generate_documentation_instructions": self._documentation_prompt,
             "generate_security_analysis_instructions": self._security_prompt,
         }
+        # Rendered prompts, keyed by prompt method and sorted argument items
+        self._render = lru_cache(maxsize=256)(self._render_prompt)
     
     def _code_review_prompt(self, focus: str = "general code quality", language: str = "python") -> str:
         return f"""You are a senior {language} code review specialist. Your role is to provide comprehensive code analysis with focus on {focus}.
@@ -88,86 +103,65 @@ RESPONSE FORMAT:
 
     def get_prompt(self, prompt_name: str, **kwargs) -> str:
         """Get a prompt with the given name and parameters."""
-        if prompt_name in self.prompts:
-            return self.prompts[prompt_name](**kwargs)
-        else:
+        prompt_fn = self.prompts.get(prompt_name)
+        if prompt_fn is None:
             return f"You are a helpful assistant. Error: Prompt '{prompt_name}' not found."
+        args_key = tuple(sorted(kwargs.items()))
+        try:
+            hash(args_key)
+        except TypeError:
+            # Unhashable argument values (e.g. lists) cannot be cached; render directly
+            return prompt_fn(**kwargs)
+        return self._render(prompt_fn, args_key)
+
+    @staticmethod
+    def _render_prompt(prompt_fn: Callable[..., str], args_key: tuple[tuple[str, Any], ...]) -> str:
+        return prompt_fn(**dict(args_key))
 
     def list_prompts(self):
         """List all available prompts."""
-        return {
-            "generate_code_review_instructions": "Generate agent instructions for code review tasks",
-            "generate_documentation_instructions": "Generate agent instructions for documentation tasks", 
-            "generate_security_analysis_instructions": "Generate agent instructions for security analysis tasks"
-        }
+        return PROMPT_DESCRIPTIONS
 
-async def get_instructions_from_prompt(prompt_server: MockPromptServer, prompt_name: str, **kwargs) -> str:
-    """Get agent instructions by calling prompt server (user-controlled)"""
-    print(f"Getting instructions from prompt: {prompt_name}")
+def get_instructions_from_prompt(prompt_server: MockPromptServer, prompt_name: str, **kwargs) -> tuple[str, list[str]]:
+    """Get agent instructions by calling prompt server (user-controlled), with the status lines to print"""
+    lines = [f"Getting instructions from prompt: {prompt_name}"]
 
     try:
         instructions = prompt_server.get_prompt(prompt_name, **kwargs)
-        print("✅ Generated instructions successfully")
-        return instructions
+        lines.append("✅ Generated instructions successfully")
+        return instructions, lines
     except Exception as e:
-        print(f"❌ Failed to get instructions: {e}")
-        return f"You are a helpful assistant. Error: {e}"
-
-async def demo_code_review(prompt_server: MockPromptServer):
-    """Demo: Code review with user-selected prompt"""
-    print("=" * 60)
-    print("DEMO 1: Code Review with Dynamic Instructions")
-    print("=" * 60)
-
-    # User explicitly selects prompt and parameters
-    instructions = await get_instructions_from_prompt(
-        prompt_server,
+        lines.append(f"❌ Failed to get instructions: {e}")
+        return f"You are a helpful assistant. Error: {e}", lines
+
+# Shared agent configuration; each demo clones it with its own instructions
+base_agent = Agent(
+    name="Prompt Server Agent",
+    model=openai_model,
+)
+
+# Demos: (title, agent name, prompt name, prompt arguments, message)
+_DEMOS = (
+    (
+        "DEMO 1: Code Review with Dynamic Instructions",
+        "Code Reviewer Agent",
         "generate_code_review_instructions",
-        focus="security vulnerabilities",
-        language="python",
-    )
-
-    agent = Agent(
-        name="Code Reviewer Agent",
-        model=openai_model,
-        instructions=instructions,  # Instructions from prompt server
-    )
-
-    message = """Please review this code:
+        {"focus": "security vulnerabilities", "language": "python"},
+        """Please review this code:
 
 def process_user_input(user_input):
     command = f"echo {user_input}"
     os.system(command)
     return "Command executed"
 
-"""
-
-    print(f"Running: {message[:60]}...")
-    result = await Runner.run(starting_agent=agent, input=message)
-    print("🧠 Response:")
-    print(result.final_output)
-
-async def demo_document_analysis(prompt_server: MockPromptServer):
-    """Demo: Document analysis with different prompt parameters"""
-    print("\n" + "=" * 60)
-    print("DEMO 2: Document Analysis with Custom Instructions")
-    print("=" * 60)
-
-    # Get instructions for document analysis
-    instructions = await get_instructions_from_prompt(
-        prompt_server,
+""",
+    ),
+    (
+        "DEMO 2: Document Analysis with Custom Instructions",
+        "Document Analysis Agent",
         "generate_documentation_instructions",
-        style="comprehensive",
-        audience="developers",
-    )
-
-    agent = Agent(
-        name="Document Analysis Agent",
-        model=openai_model,
-        instructions=instructions,
-    )
-
-    message = """Please analyze this code for documentation:
+        {"style": "comprehensive", "audience": "developers"},
+        """Please analyze this code for documentation:
 
 def calculate_total(items):
     total = 0
@@ -175,34 +169,14 @@ def calculate_total(items):
         total += item.price
     return total
 
-"""
-
-    print(f"Running: {message[:60]}...")
-    result = await Runner.run(starting_agent=agent, input=message)
-    print("🧠 Response:")
-    print(result.final_output)
-
-async def demo_security_analysis(prompt_server: MockPromptServer):
-    """Demo: Security analysis with security-focused prompt"""
-    print("\n" + "=" * 60)
-    print("DEMO 3: Security Analysis with Security Instructions")
-    print("=" * 60)
-
-    # Get instructions for security analysis
-    instructions = await get_instructions_from_prompt(
-        prompt_server,
+""",
+    ),
+    (
+        "DEMO 3: Security Analysis with Security Instructions",
+        "Security Analysis Agent",
         "generate_security_analysis_instructions",
-        level="high",
-        framework="python",
-    )
-
-    agent = Agent(
-        name="Security Analysis Agent",
-        model=openai_model,
-        instructions=instructions,
-    )
-
-    message = """Please perform a security analysis of this code:
+        {"level": "high", "framework": "python"},
+        """Please perform a security analysis of this code:
 
 import subprocess
 
@@ -210,18 +184,39 @@ def execute_command(user_input):
     result = subprocess.run(user_input, shell=True, capture_output=True)
     return result.stdout.decode()
 
-"""
+""",
+    ),
+)
+
+async def _run_demo(
+    prompt_server: MockPromptServer,
+    agent_name: str,
+    prompt_name: str,
+    arguments: dict[str, str],
+    message: str,
+) -> list[str]:
+    """Run one demo with user-selected prompt and return its output lines (without the header)"""
+    # User explicitly selects prompt and parameters
+    instructions, lines = get_instructions_from_prompt(prompt_server, prompt_name, **arguments)
+
+    agent = base_agent.clone(
+        name=agent_name,
+        instructions=instructions,  # Instructions from prompt server
+    )
 
-    print(f"Running: {message[:60]}...")
     result = await Runner.run(starting_agent=agent, input=message)
-    print("🧠 Response:")
-    print(result.final_output)
+    lines += (
+        f"Running: {message[:60]}...",
+        "🧠 Response:",
+        str(result.final_output),
+    )
+    return lines
 
 async def show_available_prompts(prompt_server: MockPromptServer):
     """Show available prompts for user selection"""
-    print("=" * 60)
+    print(_SEP60)
     print("AVAILABLE PROMPTS")
-    print("=" * 60)
+    print(_SEP60)
 
     try:
         prompts = prompt_server.list_prompts()
@@ -238,10 +233,10 @@ async def main():
     """Main function to run the prompt server example."""
     
     print("🚀 MCP Prompt Server Example")
-    print("=" * 60)
+    print(_SEP60)
     print("📝 Note: Using mock prompt server for demonstration")
     print("💡 In a real scenario, this would connect to an HTTP MCP server")
-    print("=" * 60)
+    print(_SEP60)
 
     # Create mock prompt server
     prompt_server = MockPromptServer()
@@ -250,10 +245,21 @@ async def main():
         # Show available prompts
         await show_available_prompts(prompt_server)
         
-        # Run demos
-        await demo_code_review(prompt_server)
-        await demo_document_analysis(prompt_server)
-        await demo_security_analysis(prompt_server)
+        # Run demos concurrently, then print each one's output under its own header, in order;
+        # a failed demo only replaces its own output with the error
+        outputs = await asyncio.gather(
+            *(_run_demo(prompt_server, *demo) for _, *demo in _DEMOS), return_exceptions=True
+        )
+        failed = 0
+        for i, ((title, *_), output) in enumerate(zip(_DEMOS, outputs)):
+            print(_SEP60 if i == 0 else _NL_SEP60, title, _SEP60, sep="\n")
+            if isinstance(output, BaseException):
+                failed += 1
+                print(f"❌ Error running demo: {output}")
+            else:
+                print(*output, sep="\n")
+        if failed:
+            raise RuntimeError(f"{failed} of {len(_DEMOS)} demos failed")
 
     except Exception as e:
         print(f"\n❌ Error running prompt server example: {e}")
@@ -263,9 +269,9 @@ async def main():
         print("  3. Verify that the model is available")
         return
 
-    print("\n" + "=" * 60)
+    print(_NL_SEP60)
     print("✅ Prompt Server Example Completed!")
-    print("=" * 60)
+    print(_SEP60)
     print("\n📚 Key Concepts Demonstrated:")
     print("  • Dynamic instruction generation from prompts")
     print("  • Parameterized prompt templates")
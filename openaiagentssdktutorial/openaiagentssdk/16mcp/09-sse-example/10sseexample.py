@@ -9,67 +9,101 @@ SSE servers provide real-time streaming capabilities for MCP tools.
 import asyncio
 import json
 import logging
+import re
+import time
+from functools import cache, cached_property
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional
 from openai import OpenAI
 from agents.mcp import MCPServerSse
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class SSEMCPServer:
-    """Mock SSE MCP Server for demonstration"""
-    
-    def __init__(self, port: int = 8080):
-        self.port = port
-        self.tools = {
-            "get_weather": {
-                "name": "get_weather",
-                "description": "Get current weather for a location",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "location": {
-                            "type": "string",
-                            "description": "City name or coordinates"
-                        }
-                    },
-                    "required": ["location"]
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize obj to JSON text, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+SSE_TOOLS = {
+    "get_weather": {
+        "name": "get_weather",
+        "description": "Get current weather for a location",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "location": {
+                    "type": "string",
+                    "description": "City name or coordinates"
                 }
             },
-            "get_stock_price": {
-                "name": "get_stock_price", 
-                "description": "Get current stock price for a symbol",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "symbol": {
-                            "type": "string",
-                            "description": "Stock symbol (e.g., AAPL, GOOGL)"
-                        }
-                    },
-                    "required": ["symbol"]
+            "required": ["location"]
+        }
+    },
+    "get_stock_price": {
+        "name": "get_stock_price", 
+        "description": "Get current stock price for a symbol",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Stock symbol (e.g., AAPL, GOOGL)"
                 }
             },
-            "stream_data": {
-                "name": "stream_data",
-                "description": "Stream real-time data updates",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "data_type": {
-                            "type": "string",
-                            "description": "Type of data to stream (sensor, market, logs)"
-                        },
-                        "duration": {
-                            "type": "integer",
-                            "description": "Duration in seconds to stream"
-                        }
-                    },
-                    "required": ["data_type"]
+            "required": ["symbol"]
+        }
+    },
+    "stream_data": {
+        "name": "stream_data",
+        "description": "Stream real-time data updates",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "data_type": {
+                    "type": "string",
+                    "description": "Type of data to stream (sensor, market, logs)"
+                },
+                "duration": {
+                    "type": "integer",
+                    "description": "Duration in seconds to stream"
                 }
-            }
+            },
+            "required": ["data_type"]
         }
+    }
+}
+
+# The tool schemas never change, so render them once and share the text across server instances
+_TOOL_SCHEMA_TEXT = MappingProxyType({
+    name: _dumps(info["inputSchema"], indent=True) for name, info in SSE_TOOLS.items()
+})
+
+class SSEMCPServer:
+    """Mock SSE MCP Server for demonstration"""
+    
+    def __init__(self, port: int = 8080):
+        self.port = port
+        self.tools = SSE_TOOLS
+        self.tool_schema_text = _TOOL_SCHEMA_TEXT
+    
+    @cached_property
+    def listing_text(self) -> str:
+        """Human-readable listing of every tool, built on first use"""
+        lines = []
+        for tool_name, tool_info in self.tools.items():
+            lines.append(f"Tool: {tool_name}")
+            lines.append(f"  Description: {tool_info['description']}")
+            lines.append(f"  Input Schema: {self.tool_schema_text[tool_name]}")
+            lines.append("")
+        return "\n".join(lines)
     
     async def start_server(self):
         """Start the mock SSE server"""
@@ -108,12 +142,7 @@ async def demo_sse_mcp_server():
         
         # List available tools
         logger.info("Listing available tools...")
-        tools = sse_server.tools
-        for tool_name, tool_info in tools.items():
-            logger.info(f"Tool: {tool_name}")
-            logger.info(f"  Description: {tool_info['description']}")
-            logger.info(f"  Input Schema: {json.dumps(tool_info['inputSchema'], indent=2)}")
-            logger.info("")
+        logger.info("%s", sse_server.listing_text)
         
         # Demonstrate tool usage
         logger.info("Demonstrating tool usage...")
@@ -139,7 +168,7 @@ async def demo_sse_mcp_server():
 
 async def simulate_tool_call(tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
     """Simulate calling a tool on the SSE server"""
-    logger.info(f"Calling tool: {tool_name} with arguments: {arguments}")
+    logger.info("Calling tool: %s with arguments: %s", tool_name, arguments)
     
     # Simulate processing time
     await asyncio.sleep(0.5)
@@ -164,45 +193,102 @@ async def simulate_tool_call(tool_name: str, arguments: Dict[str, Any]) -> Dict[
     else:
         return {"status": "success", "message": f"Tool {tool_name} executed successfully"}
 
+_NS_PER_SECOND = 1_000_000_000
+
+def _build_sensor_data(now_ns: int) -> Dict[str, Any]:
+    now = now_ns / _NS_PER_SECOND
+    return {
+        "timestamp": now,
+        "temperature": 20 + (now % 10),
+        "humidity": 50 + (now % 20),
+        "pressure": 1013 + (now % 5)
+    }
+
+def _build_market_data(now_ns: int) -> Dict[str, Any]:
+    now = now_ns / _NS_PER_SECOND
+    return {
+        "timestamp": now,
+        "price": 100 + (now % 10),
+        "volume": 1000 + (now_ns // _NS_PER_SECOND) % 500,
+        "bid": 99.5 + (now % 1),
+        "ask": 100.5 + (now % 1)
+    }
+
+def _build_log_data(now_ns: int) -> Dict[str, Any]:
+    return {
+        "timestamp": now_ns / _NS_PER_SECOND,
+        "message": f"Log entry {now_ns // _NS_PER_SECOND}",
+        "level": "INFO"
+    }
+
+# Stream payload builders by data type; anything else streams log entries
+_STREAM_BUILDERS = {
+    "sensor": _build_sensor_data,
+    "market": _build_market_data,
+}
+
 async def simulate_streaming_tool(tool_name: str, arguments: Dict[str, Any]):
     """Simulate a streaming tool that sends real-time updates"""
-    logger.info(f"Starting stream for tool: {tool_name}")
+    logger.info("Starting stream for tool: %s", tool_name)
     
     data_type = arguments.get("data_type", "sensor")
     duration = arguments.get("duration", 5)
     
-    start_time = asyncio.get_event_loop().time()
+    # Integer nanoseconds from the same monotonic clock the event loop uses,
+    # so whole-second fields need no float modulus or int() conversion
+    end_ns = time.monotonic_ns() + duration * _NS_PER_SECOND
+    
+    # The data type is fixed for the whole stream, so pick the builder once
+    build_data = _STREAM_BUILDERS.get(data_type, _build_log_data)
     
-    while (asyncio.get_event_loop().time() - start_time) < duration:
+    while (now_ns := time.monotonic_ns()) < end_ns:
         # Simulate real-time data
-        if data_type == "sensor":
-            data = {
-                "timestamp": asyncio.get_event_loop().time(),
-                "temperature": 20 + (asyncio.get_event_loop().time() % 10),
-                "humidity": 50 + (asyncio.get_event_loop().time() % 20),
-                "pressure": 1013 + (asyncio.get_event_loop().time() % 5)
-            }
-        elif data_type == "market":
-            data = {
-                "timestamp": asyncio.get_event_loop().time(),
-                "price": 100 + (asyncio.get_event_loop().time() % 10),
-                "volume": 1000 + int(asyncio.get_event_loop().time() % 500),
-                "bid": 99.5 + (asyncio.get_event_loop().time() % 1),
-                "ask": 100.5 + (asyncio.get_event_loop().time() % 1)
-            }
-        else:
-            data = {
-                "timestamp": asyncio.get_event_loop().time(),
-                "message": f"Log entry {int(asyncio.get_event_loop().time())}",
-                "level": "INFO"
-            }
+        data = build_data(now_ns)
         
-        logger.info(f"Stream data: {json.dumps(data, indent=2)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Stream data: %s", _dumps(data))
         await asyncio.sleep(1)
     
     logger.info("Stream completed")
 
-async def demo_sse_with_agent():
+# Keywords the mock agent routes on; each named group is one routing signal
+_QUERY_KEYWORDS = re.compile(
+    r"(?P<weather>weather)|(?P<san_francisco>san francisco)|(?P<stock>stock)"
+    r"|(?P<tesla>tesla)|(?P<stream>stream|sensor)",
+    re.IGNORECASE,
+)
+
+async def answer_agent_query(query: str):
+    """Pick the SSE tool for a query, call it, and log the agent's response"""
+    logger.info("\nAgent query: %s", query)
+    
+    # Determine which tool to use based on the query: one case-insensitive scan
+    # collects every keyword group, then the groups are checked in priority order
+    found = {match.lastgroup for match in _QUERY_KEYWORDS.finditer(query)}
+    if "weather" in found:
+        location = "San Francisco" if "san_francisco" in found else "New York"
+        result = await simulate_tool_call("get_weather", {"location": location})
+        logger.info("Agent response: The weather in %s is %s with %s conditions.", location, result['temperature'], result['condition'])
+    
+    elif "stock" in found or "tesla" in found:
+        symbol = "TSLA" if "tesla" in found else "AAPL"
+        result = await simulate_tool_call("get_stock_price", {"symbol": symbol})
+        logger.info("Agent response: %s is currently trading at %s (%s %s)", symbol, result['price'], result['change'], result['change_percent'])
+    
+    elif "stream" in found:
+        logger.info("Agent response: Starting sensor data stream...")
+        await simulate_streaming_tool("stream_data", {"data_type": "sensor", "duration": 3})
+        logger.info("Agent response: Sensor data stream completed.")
+    
+    else:
+        logger.info("Agent response: I can help you with weather, stock prices, and data streaming. What would you like to know?")
+
+@cache
+def get_openai_client() -> OpenAI:
+    """Process-wide OpenAI client, created on first use"""
+    return OpenAI()
+
+async def demo_sse_with_agent(client: Optional[OpenAI] = None):
     """Demonstrate using SSE MCP server with an OpenAI agent"""
     
     logger.info("Setting up SSE MCP server with OpenAI agent...")
@@ -222,7 +308,8 @@ async def demo_sse_with_agent():
         )
         
         # Initialize OpenAI client (you'll need to set OPENAI_API_KEY)
-        client = OpenAI()
+        if client is None:
+            client = get_openai_client()
         
         # Create agent with SSE tools
         logger.info("Creating agent with SSE tools...")
@@ -234,27 +321,8 @@ async def demo_sse_with_agent():
             "Start streaming sensor data for 3 seconds"
         ]
         
-        for query in queries:
-            logger.info(f"\nAgent query: {query}")
-            
-            # Determine which tool to use based on the query
-            if "weather" in query.lower():
-                location = "San Francisco" if "san francisco" in query.lower() else "New York"
-                result = await simulate_tool_call("get_weather", {"location": location})
-                logger.info(f"Agent response: The weather in {location} is {result['temperature']} with {result['condition']} conditions.")
-            
-            elif "stock" in query.lower() or "tesla" in query.lower():
-                symbol = "TSLA" if "tesla" in query.lower() else "AAPL"
-                result = await simulate_tool_call("get_stock_price", {"symbol": symbol})
-                logger.info(f"Agent response: {symbol} is currently trading at {result['price']} ({result['change']} {result['change_percent']})")
-            
-            elif "stream" in query.lower() or "sensor" in query.lower():
-                logger.info("Agent response: Starting sensor data stream...")
-                await simulate_streaming_tool("stream_data", {"data_type": "sensor", "duration": 3})
-                logger.info("Agent response: Sensor data stream completed.")
-            
-            else:
-                logger.info("Agent response: I can help you with weather, stock prices, and data streaming. What would you like to know?")
+        # The queries are independent, so answer them concurrently
+        await asyncio.gather(*(answer_agent_query(query) for query in queries))
         
         logger.info("SSE agent demo completed successfully!")
         
@@ -14,10 +14,21 @@ from typing import Any, Dict, List, Optional
 from openai import OpenAI
 from agents.mcp import MCPServerStreamableHttp
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize obj to JSON text, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
 class StreamableHttpMCPServer:
     """Mock Streamable HTTP MCP Server for demonstration"""
     
@@ -98,7 +109,8 @@ async def demo_streamable_http_mcp_server():
     
     # Initialize the mock streamable HTTP server
     http_server = StreamableHttpMCPServer(port=8082)
-    await http_server.start_server()
+    # Boot the server in the background while the client connection is set up
+    start_task = asyncio.create_task(http_server.start_server())
     
     try:
         # Create Streamable HTTP MCP server connection
@@ -114,6 +126,7 @@ async def demo_streamable_http_mcp_server():
                 "client_version": "1.0.0"
             }
         )
+        await start_task
         
         # List available tools
         logger.info("Listing available tools...")
@@ -121,7 +134,7 @@ async def demo_streamable_http_mcp_server():
         for tool_name, tool_info in tools.items():
             logger.info(f"Tool: {tool_name}")
             logger.info(f"  Description: {tool_info['description']}")
-            logger.info(f"  Input Schema: {json.dumps(tool_info['inputSchema'], indent=2)}")
+            logger.info(f"  Input Schema: {_dumps(tool_info['inputSchema'], indent=True)}")
             logger.info("")
         
         # Demonstrate tool usage
@@ -153,6 +166,7 @@ async def demo_streamable_http_mcp_server():
     except Exception as e:
         logger.error(f"Error in Streamable HTTP MCP server demo: {e}")
     finally:
+        start_task.cancel()  # no-op once the server is up
         await http_server.stop_server()
 
 async def simulate_streamable_tool_call(tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
@@ -175,13 +189,14 @@ async def simulate_streamable_tool_call(tool_name: str, arguments: Dict[str, Any
     elif tool_name == "batch_process":
         items = arguments.get("items", [])
         operation = arguments.get("operation", "process")
+        total_items = len(items)
         return {
             "operation": operation,
-            "total_items": len(items),
-            "processed_items": len(items),
+            "total_items": total_items,
+            "processed_items": total_items,
             "success_rate": 1.0,
-            "results": [f"{operation}_result_{i}" for i in range(len(items))],
-            "processing_time": f"{len(items) * 0.3:.1f}s"
+            "results": [f"{operation}_result_{i}" for i in range(total_items)],
+            "processing_time": f"{total_items * 0.3:.1f}s"
         }
     else:
         return {"status": "success", "message": f"Streamable tool {tool_name} executed successfully"}
@@ -193,34 +208,36 @@ async def simulate_streaming_analytics(tool_name: str, arguments: Dict[str, Any]
     metric = arguments.get("metric", "users")
     interval = arguments.get("interval", 2)
     
-    start_time = asyncio.get_event_loop().time()
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
+    
+    # A single payload dict is refreshed in place every tick; serializing it snapshots the values
+    if metric == "users":
+        data = {"timestamp": 0.0, "active_users": 0, "new_users": 0, "session_duration": 0}
+    elif metric == "sales":
+        data = {"timestamp": 0.0, "revenue": 0, "orders": 0, "average_order_value": 0}
+    else:
+        data = {"timestamp": 0.0, "performance_score": 0, "response_time": 0, "error_rate": 0.0}
     
     # Stream for 10 seconds
-    while (asyncio.get_event_loop().time() - start_time) < 10:
+    while (now := loop.time()) - start_time < 10:
         # Simulate real-time analytics data
+        data["timestamp"] = now
         if metric == "users":
-            data = {
-                "timestamp": asyncio.get_event_loop().time(),
-                "active_users": 1000 + int(asyncio.get_event_loop().time() % 500),
-                "new_users": 50 + int(asyncio.get_event_loop().time() % 20),
-                "session_duration": 300 + int(asyncio.get_event_loop().time() % 120)
-            }
+            data["active_users"] = 1000 + int(now % 500)
+            data["new_users"] = 50 + int(now % 20)
+            data["session_duration"] = 300 + int(now % 120)
         elif metric == "sales":
-            data = {
-                "timestamp": asyncio.get_event_loop().time(),
-                "revenue": 50000 + int(asyncio.get_event_loop().time() % 10000),
-                "orders": 100 + int(asyncio.get_event_loop().time() % 50),
-                "average_order_value": 500 + int(asyncio.get_event_loop().time() % 100)
-            }
+            data["revenue"] = 50000 + int(now % 10000)
+            data["orders"] = 100 + int(now % 50)
+            data["average_order_value"] = 500 + int(now % 100)
         else:
-            data = {
-                "timestamp": asyncio.get_event_loop().time(),
-                "performance_score": 85 + int(asyncio.get_event_loop().time() % 15),
-                "response_time": 200 + int(asyncio.get_event_loop().time() % 100),
-                "error_rate": 0.1 + (asyncio.get_event_loop().time() % 0.2)
-            }
+            data["performance_score"] = 85 + int(now % 15)
+            data["response_time"] = 200 + int(now % 100)
+            data["error_rate"] = 0.1 + (now % 0.2)
         
-        logger.info(f"Analytics stream data: {json.dumps(data, indent=2)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Analytics stream data: %s", _dumps(data))
         await asyncio.sleep(interval)
     
     logger.info("Analytics stream completed")
@@ -234,11 +251,13 @@ async def simulate_batch_processing(tool_name: str, arguments: Dict[str, Any]) -
     
     total_items = len(items)
     processed_items = 0
+    results = []
     
     for i, item in enumerate(items):
         # Simulate processing each item
         await asyncio.sleep(0.3)
         processed_items += 1
+        results.append(f"{operation}_result_{i}")
         
         # Log progress
         progress = (processed_items / total_items) * 100
@@ -253,10 +272,39 @@ async def simulate_batch_processing(tool_name: str, arguments: Dict[str, Any]) -
         "total_items": total_items,
         "processed_items": processed_items,
         "success_rate": (processed_items / total_items),
-        "results": [f"{operation}_result_{i}" for i in range(processed_items)],
+        "results": results,
         "processing_time": f"{total_items * 0.3:.1f}s"
     }
 
+async def _handle_document_query():
+    result = await simulate_streamable_tool_call(
+        "process_document", 
+        {"document_url": "https://example.com/report.pdf", "analysis_type": "sentiment"}
+    )
+    logger.info(f"Agent response: Document analysis complete. Sentiment score: {result['sentiment_score']}. Summary: {result['summary']}")
+
+async def _handle_analytics_query():
+    logger.info("Agent response: Starting user analytics stream...")
+    await simulate_streaming_analytics("stream_analytics", {"metric": "users", "interval": 1})
+    logger.info("Agent response: Analytics stream completed.")
+
+async def _handle_batch_query():
+    result = await simulate_batch_processing(
+        "batch_process",
+        {
+            "items": ["file1.txt", "file2.txt", "file3.txt"],
+            "operation": "validate"
+        }
+    )
+    logger.info(f"Agent response: Batch processing complete. Success rate: {result['success_rate']:.1%}. Processed {result['processed_items']} items.")
+
+# Keyword routing for agent queries, checked in order against the lowercased query
+_QUERY_HANDLERS = (
+    (("sentiment", "analyze"), _handle_document_query),
+    (("analytics", "streaming"), _handle_analytics_query),
+    (("process", "validation"), _handle_batch_query),
+)
+
 async def demo_streamable_http_with_agent():
     """Demonstrate using Streamable HTTP MCP server with an OpenAI agent"""
     
@@ -264,7 +312,8 @@ async def demo_streamable_http_with_agent():
     
     # Initialize the mock streamable HTTP server
     http_server = StreamableHttpMCPServer(port=8083)
-    await http_server.start_server()
+    # Boot the server in the background while the client connection and OpenAI client are set up
+    start_task = asyncio.create_task(http_server.start_server())
     
     try:
         # Create Streamable HTTP MCP server connection
@@ -278,6 +327,7 @@ async def demo_streamable_http_with_agent():
         
         # Initialize OpenAI client (you'll need to set OPENAI_API_KEY)
         client = OpenAI()
+        await start_task
         
         # Create agent with streamable HTTP tools
         logger.info("Creating agent with Streamable HTTP tools...")
@@ -293,28 +343,11 @@ async def demo_streamable_http_with_agent():
             logger.info(f"\nAgent query: {query}")
             
             # Determine which tool to use based on the query
-            if "sentiment" in query.lower() or "analyze" in query.lower():
-                result = await simulate_streamable_tool_call(
-                    "process_document", 
-                    {"document_url": "https://example.com/report.pdf", "analysis_type": "sentiment"}
-                )
-                logger.info(f"Agent response: Document analysis complete. Sentiment score: {result['sentiment_score']}. Summary: {result['summary']}")
-            
-            elif "analytics" in query.lower() or "streaming" in query.lower():
-                logger.info("Agent response: Starting user analytics stream...")
-                await simulate_streaming_analytics("stream_analytics", {"metric": "users", "interval": 1})
-                logger.info("Agent response: Analytics stream completed.")
-            
-            elif "process" in query.lower() or "validation" in query.lower():
-                result = await simulate_batch_processing(
-                    "batch_process",
-                    {
-                        "items": ["file1.txt", "file2.txt", "file3.txt"],
-                        "operation": "validate"
-                    }
-                )
-                logger.info(f"Agent response: Batch processing complete. Success rate: {result['success_rate']:.1%}. Processed {result['processed_items']} items.")
-            
+            query_lower = query.lower()
+            for keywords, handler in _QUERY_HANDLERS:
+                if any(keyword in query_lower for keyword in keywords):
+                    await handler()
+                    break
             else:
                 logger.info("Agent response: I can help you with document analysis, analytics streaming, and batch processing. What would you like to do?")
         
@@ -323,6 +356,7 @@ async def demo_streamable_http_with_agent():
     except Exception as e:
         logger.error(f"Error in Streamable HTTP agent demo: {e}")
     finally:
+        start_task.cancel()  # no-op once the server is up
         await http_server.stop_server()
 
 async def demo_http_streaming_comparison():
@@ -360,24 +394,18 @@ async def main():
     """Main function to run all Streamable HTTP demos"""
     logger.info("=== Streamable HTTP MCP Server Examples ===\n")
     
-    # Demo 1: Basic Streamable HTTP server functionality
+    # The demos use separate mock servers (ports 8082 and 8083) and share no state,
+    # so they run concurrently; expect their log lines to interleave
+    logger.info("Running concurrently:")
     logger.info("1. Basic Streamable HTTP MCP Server Demo")
-    logger.info("=" * 40)
-    await demo_streamable_http_mcp_server()
-    
-    logger.info("\n" + "=" * 50 + "\n")
-    
-    # Demo 2: Streamable HTTP with agent integration
     logger.info("2. Streamable HTTP MCP Server with Agent Integration")
-    logger.info("=" * 40)
-    await demo_streamable_http_with_agent()
-    
-    logger.info("\n" + "=" * 50 + "\n")
-    
-    # Demo 3: Streaming comparison
     logger.info("3. Streaming Approaches Comparison")
     logger.info("=" * 40)
-    await demo_http_streaming_comparison()
+    await asyncio.gather(
+        demo_streamable_http_mcp_server(),
+        demo_streamable_http_with_agent(),
+        demo_http_streaming_comparison(),
+    )
     
     logger.info("\n=== All Streamable HTTP examples completed! ===")
 
@@ -6,33 +6,61 @@ This server provides tools for adding numbers, getting secret words, and weather
 It runs as a streamable HTTP server that can be connected to by MCP clients.
 """
 
+import logging
 import random
-import requests
+import time
+import httpx
 from mcp.server import FastMCP
 
 # Create server
 mcp = FastMCP("Streamable HTTP Python Server")
 
+# Tool calls are logged at DEBUG level; arguments are only formatted when enabled
+logger = logging.getLogger(__name__)
+
+# Shared async HTTP client: reuses connections to wttr.in across tool calls
+# and lives as long as the server process
+_client = httpx.AsyncClient(base_url="https://wttr.in", timeout=5.0)
+
+# wttr.in reports change slowly, so answers are reused for a minute per city
+WEATHER_CACHE_TTL = 60.0
+WEATHER_CACHE_SIZE = 512
+_weather_cache: dict[str, tuple[float, str]] = {}
+
+SECRET_WORDS = ("apple", "banana", "cherry", "dragon", "elephant", "flamingo")
+_rng = random.Random()
+
 @mcp.tool()
 def add(a: int, b: int) -> int:
     """Add two numbers"""
-    print(f"[debug-server] add({a}, {b})")
+    logger.debug("add(%s, %s)", a, b)
     return a + b
 
 @mcp.tool()
 def get_secret_word() -> str:
     """Get a random secret word"""
-    print("[debug-server] get_secret_word()")
-    return random.choice(["apple", "banana", "cherry", "dragon", "elephant", "flamingo"])
+    logger.debug("get_secret_word()")
+    return _rng.choice(SECRET_WORDS)
 
 @mcp.tool()
-def get_current_weather(city: str) -> str:
+async def get_current_weather(city: str) -> str:
     """Get current weather for a city"""
-    print(f"[debug-server] get_current_weather({city})")
+    logger.debug("get_current_weather(%s)", city)
+    
+    key = city.lower()
+    cached = _weather_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] < WEATHER_CACHE_TTL:
+        return cached[1]
     
     try:
-        endpoint = "https://wttr.in"
-        response = requests.get(f"{endpoint}/{city}?format=3")
+        response = await _client.get(f"/{city}", params={"format": "3"})
+        # Only successful reports are reused; error pages (e.g. unknown location) are not
+        if response.is_success:
+            _weather_cache.pop(key, None)
+            if len(_weather_cache) >= WEATHER_CACHE_SIZE:
+                # Drop the oldest entry; dicts keep insertion order
+                del _weather_cache[next(iter(_weather_cache))]
+            _weather_cache[key] = (time.monotonic(), response.text)
         return response.text
     except Exception as e:
         return f"Error getting weather for {city}: {str(e)}"
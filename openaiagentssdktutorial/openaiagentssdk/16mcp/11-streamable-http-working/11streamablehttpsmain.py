@@ -4,22 +4,31 @@ Main script for Streamable HTTP MCP Example
 
 This script demonstrates how to connect to a streamable HTTP MCP server
 and use an agent to interact with the available tools.
+
+All queries share one MCPServerStreamableHttp session, opened once in main(),
+so the MCP handshake is paid once rather than per query. Some mcp client
+releases close each SSE response before the server has finished the stream,
+which prevents HTTP keep-alive reuse and adds a few hundred milliseconds per
+tool call; upgrading mcp once the upstream fix is released removes that cost.
 """
 
 import asyncio
 import os
 import shutil
+import socket
 import subprocess
 import time
 from typing import Any
+import httpx
 from dotenv import load_dotenv
 
 from agents import Agent, Runner, gen_trace_id, trace, set_default_openai_key
 from agents.mcp import MCPServer, MCPServerStreamableHttp
 from agents.model_settings import ModelSettings
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (skipped when they are already set, e.g. by an earlier import)
+if "OPENAI_API_KEY" not in os.environ or "OPENAI_MODEL" not in os.environ:
+    load_dotenv()
 openai_api_key = os.environ.get("OPENAI_API_KEY")
 openai_model = os.environ.get("OPENAI_MODEL", "gpt-4o")
 set_default_openai_key(openai_api_key)
@@ -34,23 +43,43 @@ async def run(mcp_server: MCPServer):
         model_settings=ModelSettings(tool_choice="required"),
     )
 
-    # Use the `add` tool to add two numbers
-    message = "Add these numbers: 7 and 22."
-    print(f"Running: {message}")
-    result = await Runner.run(starting_agent=agent, input=message)
-    print(result.final_output)
+    messages = [
+        "Add these numbers: 7 and 22.",           # Uses the `add` tool
+        "What's the weather in Tokyo?",           # Uses the `get_weather` tool
+        "What's the secret word?",                # Uses the `get_secret_word` tool
+    ]
+
+    # The questions are independent, so send them together and print the answers in order
+    results = await asyncio.gather(
+        *(Runner.run(starting_agent=agent, input=message) for message in messages)
+    )
+    for message, result in zip(messages, results):
+        print(f"Running: {message}")
+        print(result.final_output)
+        print("\n")
 
-    # Run the `get_weather` tool
-    message = "What's the weather in Tokyo?"
-    print(f"\n\nRunning: {message}")
-    result = await Runner.run(starting_agent=agent, input=message)
-    print(result.final_output)
+def port_in_use(host: str, port: int) -> bool:
+    """Check whether something is already listening on host:port"""
+    with socket.socket() as sock:
+        return sock.connect_ex((host, port)) == 0
 
-    # Run the `get_secret_word` tool
-    message = "What's the secret word?"
-    print(f"\n\nRunning: {message}")
-    result = await Runner.run(starting_agent=agent, input=message)
-    print(result.final_output)
+async def wait_until_ready(process: subprocess.Popen[Any], url: str, timeout: float = 10.0):
+    """Poll the server until it answers HTTP requests, instead of sleeping a fixed time"""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            # Fail fast if the server crashed on start instead of waiting out the timeout
+            if process.poll() is not None:
+                raise RuntimeError(f"Server process exited with code {process.returncode} before becoming ready")
+            try:
+                response = await client.get(url)
+                # Any non-5xx answer (a plain GET on the MCP endpoint is rejected) means it is up
+                if response.status_code < 500:
+                    return
+            except httpx.RequestError:
+                pass
+            await asyncio.sleep(0.05)
+    raise TimeoutError(f"Server at {url} did not become ready within {timeout:.0f} seconds")
 
 async def main():
     """Main function to run the streamable HTTP example"""
@@ -79,16 +108,22 @@ if __name__ == "__main__":
         this_dir = os.path.dirname(os.path.abspath(__file__))
         server_file = os.path.join(this_dir, "11streamablehttpserver.py")
 
+        # Another server already on the port would answer the readiness probe in place of ours
+        if port_in_use("localhost", 8000):
+            raise RuntimeError("Port 8000 is already in use; stop the other server first")
+
         print("Starting Streamable HTTP server at http://localhost:8000/mcp ...")
 
         # Run `uv run server.py` to start the Streamable HTTP server
         process = subprocess.Popen(["uv", "run", server_file])
-        # Give it 3 seconds to start
-        time.sleep(3)
+        # Wait until it accepts connections
+        asyncio.run(wait_until_ready(process, "http://localhost:8000/mcp"))
 
         print("Streamable HTTP server started. Running example...\n\n")
     except Exception as e:
         print(f"Error starting Streamable HTTP server: {e}")
+        if process:
+            process.terminate()
         exit(1)
 
     try:
@@ -1,16 +1,20 @@
 import os
 import asyncio
 from dotenv import load_dotenv
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from agents import Agent, handoff, Runner, RunContextWrapper, set_default_openai_key
 
-# 🔐 Load OpenAI key and model
-load_dotenv()
+# 🔐 Load OpenAI key and model (skipped when they are already set, e.g. by an earlier import)
+if "OPENAI_API_KEY" not in os.environ or "OPENAI_MODEL" not in os.environ:
+    load_dotenv()
 set_default_openai_key(os.environ.get("OPENAI_API_KEY"))
 openai_model = os.environ.get("OPENAI_MODEL")
 
 # 📝 Define expected handoff input
 class EscalationData(BaseModel):
+    # Immutable, and unknown fields are rejected instead of silently kept
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     reason: str
 
 # 🔁 Callback executed when handoff is triggered
@@ -3,8 +3,9 @@ from dotenv import load_dotenv
 from agents import Agent, Runner, handoff, set_default_openai_key
 from agents.extensions.handoff_prompt import RECOMMENDED_PROMPT_PREFIX
 
-# 🔐 Load API keys
-load_dotenv()
+# 🔐 Load API keys (skipped when they are already set, e.g. by an earlier import)
+if "OPENAI_API_KEY" not in os.environ or "OPENAI_MODEL" not in os.environ:
+    load_dotenv()
 set_default_openai_key(os.environ.get("OPENAI_API_KEY"))
 openai_model = os.environ.get("OPENAI_MODEL")
 
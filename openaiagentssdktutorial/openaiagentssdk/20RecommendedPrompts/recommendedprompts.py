@@ -4,7 +4,9 @@ import asyncio
 from dotenv import load_dotenv
 import os
 
-load_dotenv()
+# Load environment variables (skipped when the key is already set, e.g. by an earlier import)
+if "OPENAI_API_KEY" not in os.environ:
+    load_dotenv()
 
 openai_api_key = os.environ.get("OPENAI_API_KEY")
 set_default_openai_key(openai_api_key)
@@ -88,6 +90,13 @@ async def compare_responses(query):
     result = await Runner.run(standard_agent, input=query)
     print(result.final_output)
 
+# Agents selectable in interactive mode, keyed by menu number
+_AGENT_CHOICES = {
+    1: (billing_agent, "Billing Agent"),
+    2: (support_agent, "Technical Support Agent"),
+    3: (standard_agent, "Standard Agent"),
+}
+
 async def main():
     
     # Print the recommended prompt prefix for reference
@@ -119,36 +128,34 @@ async def main():
     print(result.final_output)
     
     # Interactive mode
-    print("\n=== Interactive Mode ===")
-    print("Choose an agent to interact with:")
-    print("1. Billing Agent (with recommended prompt)")
-    print("2. Technical Support Agent (with recommended prompt)")
-    print("3. Standard Agent (without recommended prompt)")
-    print("Type 'exit' to quit")
+    print(
+        "\n=== Interactive Mode ===",
+        "Choose an agent to interact with:",
+        "1. Billing Agent (with recommended prompt)",
+        "2. Technical Support Agent (with recommended prompt)",
+        "3. Standard Agent (without recommended prompt)",
+        "Type 'exit' to quit",
+        sep="\n",
+    )
     
     while True:
         agent_choice = input("\nSelect agent (1-3): ")
-        if agent_choice.lower() == 'exit':
+        if agent_choice.strip().lower() == 'exit':
             break
         
         try:
             agent_num = int(agent_choice)
-            if agent_num == 1:
-                selected_agent = billing_agent
-                print("Using Billing Agent")
-            elif agent_num == 2:
-                selected_agent = support_agent
-                print("Using Technical Support Agent")
-            elif agent_num == 3:
-                selected_agent = standard_agent
-                print("Using Standard Agent")
-            else:
-                print("Invalid choice. Please select 1-3.")
-                continue
         except ValueError:
             print("Invalid input. Please enter a number 1-3.")
             continue
         
+        choice = _AGENT_CHOICES.get(agent_num)
+        if choice is None:
+            print("Invalid choice. Please select 1-3.")
+            continue
+        selected_agent, agent_label = choice
+        print(f"Using {agent_label}")
+        
         user_query = input("Your query: ")
         if user_query.lower() == 'exit':
             break
@@ -2,10 +2,12 @@ from agents import Agent, Runner, trace, set_default_openai_key
 import asyncio
 from dotenv import load_dotenv
 import os
-import time
 import random
+import re
 
-load_dotenv()
+# Load environment variables (skipped when the key is already set, e.g. by an earlier import)
+if "OPENAI_API_KEY" not in os.environ:
+    load_dotenv()
 
 openai_api_key = os.environ.get("OPENAI_API_KEY")
 set_default_openai_key(openai_api_key)
@@ -61,6 +63,29 @@ improvement_agent = Agent(
     """,
 )
 
+# Prompt templates for the workshop steps, filled in with str.format per call
+_GEN_PROMPT = "Create a funny joke about {topic}. Make it original and clever."
+_RATE_PROMPT = 'Please rate this joke about {topic}: "{joke}"'
+_IMPROVE_PROMPT = 'Please improve this joke about {topic}: "{joke}". Make it funnier while keeping its essence.'
+_RATE_IMPROVED_PROMPT = 'Please rate this improved joke about {topic}: "{joke}"'
+
+# Pattern for the numeric score in the rating agent's "Rating: [1-10]" line
+_RATING_RE = re.compile(r"Rating:\s*(\d+)")
+
+# Extract the numeric rating, or -1 when the rating agent did not follow the format
+def rating_score(rating):
+    match = _RATING_RE.search(rating)
+    return int(match.group(1)) if match else -1
+
+# Run one agent call inside its own named trace
+async def run_traced(name, agent, prompt):
+    with trace(name):
+        return await Runner.run(agent, prompt)
+
+# Same as run_traced, but also returns the caller's index so out-of-order results can be placed
+async def run_indexed(index, name, agent, prompt):
+    return index, await run_traced(name, agent, prompt)
+
 # Function to simulate a joke workshop process
 async def joke_workshop(topic):
     print(f"\n=== Starting Joke Workshop on '{topic}' ===\n")
@@ -69,54 +94,40 @@ async def joke_workshop(topic):
     with trace(f"Joke Workshop: {topic}"):
         # Step 1: Generate initial jokes
         print("Step 1: Generating initial jokes...")
-        jokes = []
         
-        # Generate 3 different jokes on the topic
-        for i in range(3):
-            with trace(f"Generate Joke #{i+1}"):
-                result = await Runner.run(joke_agent, f"Create a funny joke about {topic}. Make it original and clever.")
-                jokes.append(result.final_output)
-                print(f"Joke #{i+1}: {result.final_output}")
-                # Add a small delay to simulate processing time
-                time.sleep(0.5)
+        # Generate 3 different jokes on the topic; the calls are independent, so run them concurrently
+        prompt = _GEN_PROMPT.format(topic=topic)
+        results = await asyncio.gather(*(
+            run_traced(f"Generate Joke #{i+1}", joke_agent, prompt) for i in range(3)
+        ))
+        jokes = [result.final_output for result in results]
+        for i, joke in enumerate(jokes):
+            print(f"Joke #{i+1}: {joke}")
         
         # Step 2: Rate each joke
         print("\nStep 2: Rating jokes...")
-        ratings = []
         
-        for i, joke in enumerate(jokes):
-            with trace(f"Rate Joke #{i+1}"):
-                result = await Runner.run(rating_agent, f"Please rate this joke about {topic}: \"{joke}\"")
-                ratings.append(result.final_output)
-                print(f"Rating for Joke #{i+1}: {result.final_output}")
-                time.sleep(0.5)
+        # Print each rating as soon as it arrives, but keep `ratings` in joke order
+        prompts = [_RATE_PROMPT.format(topic=topic, joke=joke) for joke in jokes]
+        ratings = [None] * len(jokes)
+        for next_rating in asyncio.as_completed([
+            run_indexed(i, f"Rate Joke #{i+1}", rating_agent, prompt) for i, prompt in enumerate(prompts)
+        ]):
+            i, result = await next_rating
+            ratings[i] = result.final_output
+            print(f"Rating for Joke #{i+1}: {ratings[i]}")
         
         # Step 3: Improve the best joke
         print("\nStep 3: Improving the best joke...")
         
-        # Find the joke with the highest rating (simple parsing)
-        best_joke_index = 0
-        highest_rating = 0
-        
-        for i, rating in enumerate(ratings):
-            try:
-                # Extract the numeric rating (assuming format "Rating: [1-10]")
-                rating_value = int(rating.split("Rating:")[1].split("\n")[0].strip())
-                if rating_value > highest_rating:
-                    highest_rating = rating_value
-                    best_joke_index = i
-            except:
-                # If parsing fails, just continue
-                continue
+        # Find the joke with the highest rating (unparseable ratings score -1; ties keep the first joke)
+        best_joke_index = max(range(len(ratings)), key=lambda i: rating_score(ratings[i]))
         
         best_joke = jokes[best_joke_index]
         print(f"Best joke selected: {best_joke}")
         
         with trace("Improve Best Joke"):
-            result = await Runner.run(
-                improvement_agent, 
-                f"Please improve this joke about {topic}: \"{best_joke}\". Make it funnier while keeping its essence."
-            )
+            result = await Runner.run(improvement_agent, _IMPROVE_PROMPT.format(topic=topic, joke=best_joke))
             improved_joke = result.final_output
             print(f"\nImproved joke: {improved_joke}")
         
@@ -124,7 +135,7 @@ async def joke_workshop(topic):
         print("\nStep 4: Rating the improved joke...")
         
         with trace("Rate Improved Joke"):
-            result = await Runner.run(rating_agent, f"Please rate this improved joke about {topic}: \"{improved_joke}\"")
+            result = await Runner.run(rating_agent, _RATE_IMPROVED_PROMPT.format(topic=topic, joke=improved_joke))
             final_rating = result.final_output
             print(f"Final rating: {final_rating}")
         
@@ -161,7 +172,7 @@ async def nested_trace_demo():
         
         with trace("Initial Greeting"):
             print("Greeting the customer...")
-            time.sleep(0.5)
+            await asyncio.sleep(0.5)
             print("Customer greeted successfully")
         
         with trace("Joke Request"):
@@ -174,12 +185,12 @@ async def nested_trace_demo():
             
             with trace("Joke Delivery"):
                 print("Delivering joke to customer...")
-                time.sleep(0.5)
+                await asyncio.sleep(0.5)
                 print("Joke delivered successfully")
         
         with trace("Customer Feedback"):
             print("Getting customer feedback...")
-            time.sleep(0.5)
+            await asyncio.sleep(0.5)
             feedback = random.choice(["loved it", "thought it was okay", "didn't laugh"])
             print(f"Customer {feedback}")
         
@@ -200,8 +211,11 @@ async def main():
         await joke_workshop(topic)
     
     # Interactive mode
-    print("\n=== Interactive Joke Workshop ===")
-    print("Enter a topic for a joke workshop, or 'exit' to quit")
+    print(
+        "\n=== Interactive Joke Workshop ===",
+        "Enter a topic for a joke workshop, or 'exit' to quit",
+        sep="\n",
+    )
     
     while True:
         topic = input("\nJoke topic: ")
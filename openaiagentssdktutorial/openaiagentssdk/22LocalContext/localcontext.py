@@ -1,13 +1,14 @@
 import asyncio
 from dataclasses import dataclass
 from typing import List, Optional, Dict
-import json
 
 from agentswithopenai import Agent, RunContextWrapper, Runner, function_tool, set_default_openai_key
 from dotenv import load_dotenv
 import os
 
-load_dotenv()
+# Load environment variables (skipped when the key is already set, e.g. by an earlier import)
+if "OPENAI_API_KEY" not in os.environ:
+    load_dotenv()
 
 openai_api_key = os.environ.get("OPENAI_API_KEY")
 set_default_openai_key(openai_api_key)
@@ -48,10 +49,7 @@ async def fetch_user_preferences(wrapper: RunContextWrapper[UserInfo]) -> str:
     if not user.preferences:
         return "No preferences have been set."
     
-    result = "User Preferences:\n"
-    for key, value in user.preferences.items():
-        result += f"- {key}: {value}\n"
-    return result
+    return "User Preferences:\n" + "".join(f"- {key}: {value}\n" for key, value in user.preferences.items())
 
 @function_tool
 async def fetch_purchase_history(wrapper: RunContextWrapper[UserInfo]) -> str:
@@ -60,10 +58,10 @@ async def fetch_purchase_history(wrapper: RunContextWrapper[UserInfo]) -> str:
     if not user.purchase_history:
         return "No purchase history available."
     
-    result = "Purchase History:\n"
-    for i, purchase in enumerate(user.purchase_history, 1):
-        result += f"{i}. {purchase.get('item', 'Unknown item')} - ${purchase.get('price', 0):.2f} on {purchase.get('date', 'Unknown date')}\n"
-    return result
+    return "Purchase History:\n" + "".join(
+        f"{i}. {purchase.get('item', 'Unknown item')} - ${purchase.get('price', 0):.2f} on {purchase.get('date', 'Unknown date')}\n"
+        for i, purchase in enumerate(user.purchase_history, 1)
+    )
 
 @function_tool
 async def update_preference(wrapper: RunContextWrapper[UserInfo], key: str, value: str) -> str:
@@ -72,41 +70,40 @@ async def update_preference(wrapper: RunContextWrapper[UserInfo], key: str, valu
     user.preferences[key] = value
     return f"Updated preference: {key} = {value}"
 
+# Features per subscription tier, with each tier's tool response rendered once at import
+_FEATURES = {
+    "free": (
+        "Basic content access",
+        "Limited searches per day",
+        "Standard support"
+    ),
+    "basic": (
+        "Full content access",
+        "Unlimited searches",
+        "Priority email support",
+        "Bookmark feature"
+    ),
+    "premium": (
+        "All Basic features",
+        "Exclusive premium content",
+        "Advanced analytics",
+        "24/7 priority support",
+        "Offline access",
+        "No advertisements"
+    )
+}
+_FEATURES_RENDERED = {
+    tier: f"Features for {tier.capitalize()} tier:\n" + "".join(f"- {feature}\n" for feature in features)
+    for tier, features in _FEATURES.items()
+}
+
 @function_tool
 async def get_subscription_features(wrapper: RunContextWrapper[UserInfo]) -> str:
     """Get the features available for the user's subscription tier."""
     user = wrapper.context
     
-    features = {
-        "free": [
-            "Basic content access",
-            "Limited searches per day",
-            "Standard support"
-        ],
-        "basic": [
-            "Full content access",
-            "Unlimited searches",
-            "Priority email support",
-            "Bookmark feature"
-        ],
-        "premium": [
-            "All Basic features",
-            "Exclusive premium content",
-            "Advanced analytics",
-            "24/7 priority support",
-            "Offline access",
-            "No advertisements"
-        ]
-    }
-    
     tier = user.subscription_tier.lower()
-    if tier not in features:
-        return f"Unknown subscription tier: {tier}"
-    
-    result = f"Features for {tier.capitalize()} tier:\n"
-    for feature in features[tier]:
-        result += f"- {feature}\n"
-    return result
+    return _FEATURES_RENDERED.get(tier, f"Unknown subscription tier: {tier}")
 
 # Create an agent with UserInfo context
 user_agent = Agent[UserInfo](
@@ -224,10 +221,12 @@ async def main():
             user = await interact_with_user(user, query)
     
     # Interactive mode
-    print("\n=== Interactive Mode ===")
-    print("Select a user to interact with:")
-    for uid, user in users.items():
-        print(f"{uid}: {user.name} ({user.subscription_tier} tier)")
+    print(
+        "\n=== Interactive Mode ===",
+        "Select a user to interact with:",
+        *(f"{uid}: {user.name} ({user.subscription_tier} tier)" for uid, user in users.items()),
+        sep="\n",
+    )
     
     while True:
         try: